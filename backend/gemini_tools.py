@@ -1,317 +1,221 @@
 from google.genai import types
-import travel_mock_data
-import json
+from travel_mock_data import STDOUT_LOCK, json_dumps, get_booking_details
+import atexit
+import functools
+import inspect
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime, timezone
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(name)s - %(funcName)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+# Records propagate to the root logger; the application's logging setup decides output
 logger = logging.getLogger(__name__)
 
+# Structured TOOL_EVENT lines feed /api/logs; set TOOL_EVENT_LOGGING=false to skip building them
+TOOL_EVENT_LOGGING_ENABLED = os.getenv("TOOL_EVENT_LOGGING", "true").lower() == "true"
 
-# Helper function for structured logging
-def _log_tool_event(
-    event_type: str, tool_name: str, parameters: dict, response: dict = None
-):
-    """Helper function to create and print a structured log entry for tool events."""
-    log_payload = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "log_type": "TOOL_EVENT",
-        "event_subtype": event_type,
-        "tool_function_name": tool_name,
-        "parameters_sent": parameters,
-    }
-    if response is not None:
-        log_payload["response_received"] = response
-    print(json.dumps(log_payload))
-
-
-# Function Declarations from tool_call.json
-
-NameCorrectionAgent_declaration = types.FunctionDeclaration(
-    name="NameCorrectionAgent",
-    description="This **NameCorrectionAgent** will take care of name corrections  as well as name change also for given bookingID/PNR. This agent handles various types of name corrections including spelling corrections, name swaps, gender corrections, maiden name changes, and title removals.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "correction_type": types.Schema(
-                type=types.Type.STRING,
-                description="Type of name correction required.",
-                enum=[
-                    "NAME_CORRECTION",
-                    "NAME_SWAP",
-                    "GENDER_SWAP",
-                    "MAIDEN_NAME_CHANGE",
-                    "REMOVE_TITLE",
-                ],
-            ),
-            "fn": types.Schema(
-                type=types.Type.STRING, description="First Name of the passenger."
-            ),
-            "ln": types.Schema(
-                type=types.Type.STRING, description="Last Name of the passenger."
-            ),
-        },
-        required=["correction_type", "fn", "ln"],
-    ),
-)
 
-SpecialClaimAgent_declaration = types.FunctionDeclaration(
-    name="SpecialClaimAgent",
-    description="This **SpecialClaimAgent** handles special claim requests for flight bookings. This agent helps users file claims for various flight-related issues and disruptions.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "claim_type": types.Schema(
-                type=types.Type.STRING,
-                description="Type of special claim being filed by the user",
-                enum=[
-                    "FLIGHT_NOT_OPERATIONAL",
-                    "MEDICAL_EMERGENCY",
-                    "TICKET_CANCELLED_WITH_AIRLINE",
-                ],
-            )
-        },
-        required=["claim_type"],
-    ),
-)
+def _read_sample_rate() -> int:
+    """Parses TOOL_EVENT_READ_SAMPLE_RATE, falling back to 1 (log every call)."""
+    raw_value = os.getenv("TOOL_EVENT_READ_SAMPLE_RATE", "1")
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "Ignoring invalid TOOL_EVENT_READ_SAMPLE_RATE=%r; logging every call",
+            raw_value,
+        )
+        return 1
 
-Enquiry_Tool_declaration = types.FunctionDeclaration(
-    name="Enquiry_Tool",
-    description="Helps user to get related documents for user query. Only help to retrieve relevant documentation for a enquiry or support.",
-    parameters=types.Schema(type=types.Type.OBJECT, properties={}),
-)
 
-Eticket_Sender_Agent_declaration = types.FunctionDeclaration(
-    name="Eticket_Sender_Agent",
-    description="Sends the e-ticket for the given PNR or Booking ID via supported communication channels whatsapp and email.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "booking_id_or_pnr": types.Schema(
-                type=types.Type.STRING,
-                description="The booking ID or PNR of the user itinerary.",
-            )
-        },
-        required=["booking_id_or_pnr"],
-    ),
+# Log 1 in N successful calls of read-only tools; errors and other tools always log
+READ_ONLY_TOOL_EVENT_SAMPLE_RATE = _read_sample_rate()
+_READ_ONLY_TOOLS = frozenset(
+    {"Enquiry_Tool", "ObservabilityAgent", "Flight_Booking_Details_Agent"}
 )
 
-ObservabilityAgent_declaration = types.FunctionDeclaration(
-    name="ObservabilityAgent",
-    description="This tool tracks or fetches the refund status for a given Booking ID based on a specific user operation.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "operation_type": types.Schema(
-                type=types.Type.STRING,
-                description="Type of operation_type being filed by the user",
-                enum=["CANCELLATION", "DATE_CHANGE"],
-            )
-        },
-        required=["operation_type"],
-    ),
-)
+# Serialized TOOL_EVENT lines waiting for the background writer; full queue drops events
+_TOOL_EVENT_QUEUE = queue.Queue(maxsize=10_000)
+_TOOL_EVENT_STOP = object()
+
+
+def _tool_event_writer():
+    """Drains queued TOOL_EVENT lines to stdout, flushing once per batch."""
+    while True:
+        line = _TOOL_EVENT_QUEUE.get()
+        while line is not None:
+            if line is _TOOL_EVENT_STOP:
+                sys.stdout.flush()
+                return
+            # One whole line per write: StdoutTee parses each line as a JSON event
+            with STDOUT_LOCK:
+                sys.stdout.write(line + "\n")
+            try:
+                line = _TOOL_EVENT_QUEUE.get_nowait()
+            except queue.Empty:
+                line = None
+        sys.stdout.flush()
+
+
+def _stop_tool_event_writer():
+    _TOOL_EVENT_QUEUE.put(_TOOL_EVENT_STOP)
+    _tool_event_thread.join(timeout=5)
+
+
+if TOOL_EVENT_LOGGING_ENABLED:
+    _tool_event_thread = threading.Thread(
+        target=_tool_event_writer, name="tool-event-writer", daemon=True
+    )
+    _tool_event_thread.start()
+    atexit.register(_stop_tool_event_writer)
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") so only the fractional part is formatted per event
+_timestamp_cache = (None, "")
+
+
+def _utc_timestamp() -> str:
+    """Returns the current UTC time in the same ISO format as datetime.isoformat()."""
+    global _timestamp_cache
+    # Integer nanoseconds, floored to microseconds like datetime.now() does
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _timestamp_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%S"
+        )
+        _timestamp_cache = (second, prefix)
+    micros = nanos // 1_000
+    if not micros:
+        # isoformat() leaves out the fraction when microsecond is 0
+        return f"{prefix}+00:00"
+    return f"{prefix}.{micros:06d}+00:00"
+
+
+def _tool_event_template(tool_name: str) -> dict:
+    """Builds the per-tool TOOL_EVENT payload skeleton, in the logged key order."""
+    return {
+        "timestamp": None,
+        "log_type": "TOOL_EVENT",
+        "event_subtype": None,
+        "tool_function_name": tool_name,
+        "parameters_sent": None,
+    }
 
-DateChangeAgent_declaration = types.FunctionDeclaration(
-    name="DateChangeAgent",
-    description="Quotes penalties or executes date change for an existing itinerary.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "action": types.Schema(
-                type=types.Type.STRING,
-                description="Choose QUOTE to fetch penalty/fare difference information, CONFIRM to execute the date change.",
-                enum=["QUOTE", "CONFIRM"],
-            ),
-            "sector_info": types.Schema(
-                type=types.Type.ARRAY,
-                description="List of sectors/journeys to change with their new dates.",
-                items=types.Schema(
-                    type=types.Type.OBJECT,
-                    properties={
-                        "origin": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the origin city (e.g., DEL).",
-                        ),
-                        "destination": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the destination city (e.g., BOM).",
-                        ),
-                        "newDate": types.Schema(
-                            type=types.Type.STRING,
-                            description="New date for the journey in YYYY-MM-DD format (e.g., 2024-01-15).",
-                        ),
-                    },
-                    required=["origin", "destination", "newDate"],
-                ),
-            ),
-        },
-        required=["action", "sector_info"],
-    ),
-)
 
-Connect_To_Human_Tool_declaration = types.FunctionDeclaration(
-    name="Connect_To_Human_Tool",
-    description="Helps user to connect with human agent.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "reason_of_invoke": types.Schema(
-                type=types.Type.STRING,
-                description="Was the user frustrated or you are not able to help.",
-                enum=["FRUSTRATED", "UNABLE_TO_HELP"],
-            ),
-            "frustration_score": types.Schema(
-                type=types.Type.STRING,
-                description="How frustrated is the user in the conversation on a scale of 1 to 10.",
-            ),
-        },
-        required=["reason_of_invoke"],
-    ),
-)
+def _enqueue_tool_event(log_payload: dict):
+    """Serializes a TOOL_EVENT payload and queues it for the background writer."""
+    # Serialize now so later mutations of shared records don't leak into the event
+    try:
+        _TOOL_EVENT_QUEUE.put_nowait(json_dumps(log_payload))
+    except queue.Full:
+        pass  # Drop the event rather than stall the tool call
 
-Booking_Cancellation_Agent_declaration = types.FunctionDeclaration(
-    name="Booking_Cancellation_Agent",
-    description="Quotes penalties or executes cancellations for an existing itinerary.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "action": types.Schema(
-                type=types.Type.STRING,
-                description="Choose QUOTE to fetch refund/penalty information, CONFIRM to execute the cancellation.",
-                enum=["QUOTE", "CONFIRM"],
-                default="QUOTE",
-            ),
-            "cancel_scope": types.Schema(
-                type=types.Type.STRING,
-                description="Defaults to NOT_MENTIONED. Type of cancellation - FULL or PARTIAL. Don't ask this information upfront. ONLY fill when user mentions about it.",
-                enum=["NOT_MENTIONED", "FULL", "PARTIAL"],
-                default="NOT_MENTIONED",
-            ),
-            "otp": types.Schema(
-                type=types.Type.STRING,
-                description="OTP (One Time Password) for confirmation use case. And it's length is **4 digit**. NOT A MANDATORY FIELD.",
-                default="",
-            ),
-            "partial_info": types.Schema(
-                type=types.Type.ARRAY,
-                description="Required **only** when cancel_scope = PARTIAL. Provide a list of journeys and passengers to cancel.",
-                items=types.Schema(
-                    type=types.Type.OBJECT,
-                    properties={
-                        "journey": types.Schema(
-                            type=types.Type.OBJECT,
-                            properties={
-                                "from_city": types.Schema(
-                                    type=types.Type.STRING,
-                                    description="Airport Code of the origin city (e.g., DEL).",
-                                ),
-                                "to_city": types.Schema(
-                                    type=types.Type.STRING,
-                                    description="Airport Code of the destination city (e.g., BOM).",
-                                ),
-                            },
-                        ),
-                        "pax_to_cancel": types.Schema(
-                            type=types.Type.ARRAY,
-                            description="List of passengers to cancel for the specified journey.",
-                            items=types.Schema(
-                                type=types.Type.OBJECT,
-                                properties={
-                                    "fn": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="First Name of the passenger.",
-                                    ),
-                                    "ln": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="Last Name of the passenger.",
-                                    ),
-                                },
-                            ),
-                        ),
-                    },
-                ),
-            ),
-        },
-        required=["action"],
-    ),
-)
 
-Flight_Booking_Details_Agent_declaration = types.FunctionDeclaration(
-    name="Flight_Booking_Details_Agent",
-    description="Retrieves the full itinerary record for a given PNR / Booking ID—passengers, flight segments, departure & arrival times, airlines, fare classes, and ancillary add-ons.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "booking_id_or_pnr": types.Schema(
-                type=types.Type.STRING,
-                description="The booking ID or PNR of the user itinerary.",
-            )
-        },
-        required=["booking_id_or_pnr"],
-    ),
-)
+def _tool_event_payload(
+    template: dict, event_type: str, parameters: dict, timestamp: str
+) -> dict:
+    """Fills a copy of a tool's payload skeleton for one event."""
+    log_payload = template.copy()
+    log_payload["timestamp"] = timestamp
+    log_payload["event_subtype"] = event_type
+    log_payload["parameters_sent"] = parameters
+    return log_payload
+
+
+def _log_tool_start(template: dict, parameters: dict, timestamp: str = None):
+    """Queues the INVOCATION_START event for a tool call, stamped now unless given."""
+    _enqueue_tool_event(
+        _tool_event_payload(
+            template, "INVOCATION_START", parameters, timestamp or _utc_timestamp()
+        )
+    )
+
+
+def _log_tool_end(template: dict, parameters: dict, response: dict):
+    """Queues the INVOCATION_END event, including the tool's response."""
+    log_payload = _tool_event_payload(
+        template, "INVOCATION_END", parameters, _utc_timestamp()
+    )
+    log_payload["response_received"] = response
+    _enqueue_tool_event(log_payload)
+
+
+def _logged_tool(func):
+    """Decorator that logs INVOCATION_START/INVOCATION_END tool events around an async tool
+    and turns unexpected exceptions into a per-tool ERROR response."""
+    tool_name = func.__name__
+    # (name, default) pairs in signature order; parameters without a default log as None
+    param_defaults = tuple(
+        (name, None if param.default is inspect.Parameter.empty else param.default)
+        for name, param in inspect.signature(func).parameters.items()
+    )
+    param_names = tuple(name for name, _ in param_defaults)
+    error_response = {
+        "status": "ERROR",
+        "message": f"An error occurred while processing {tool_name}",
+    }
+    sampled = (
+        tool_name in _READ_ONLY_TOOLS and READ_ONLY_TOOL_EVENT_SAMPLE_RATE > 1
+    )
+    call_counter = itertools.count()
+    event_template = _tool_event_template(tool_name)
+
+    def handle_error() -> dict:
+        logger.exception("Tool %s failed", tool_name)
+        # FunctionResponse needs a plain dict, so hand out a copy of the template
+        return dict(error_response)
+
+    if not TOOL_EVENT_LOGGING_ENABLED:
+        # Nothing will be logged, so don't build params_sent on every call
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            coro = func(*args, **kwargs)  # Argument errors raise here, outside the try
+            try:
+                return await coro
+            except Exception:
+                return handle_error()
+
+        return wrapper
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        # Creating the coroutine outside the try lets bad arguments from the model
+        # raise their native TypeError to the caller instead of the error envelope
+        coro = func(*args, **kwargs)
+        params_sent = dict(param_defaults)
+        params_sent.update(zip(param_names, args))
+        params_sent.update(kwargs)
+        if sampled:
+            # START is only logged if the call is kept, but must carry the pre-call time
+            started_at = _utc_timestamp()
+        else:
+            _log_tool_start(event_template, params_sent)
+        try:
+            response = await coro
+        except Exception:
+            response = handle_error()
+        if sampled:
+            # Decide after the call so a skipped read logs neither START nor END
+            if (
+                response.get("status") == "SUCCESS"
+                and next(call_counter) % READ_ONLY_TOOL_EVENT_SAMPLE_RATE
+            ):
+                return response
+            _log_tool_start(event_template, params_sent, started_at)
+        _log_tool_end(event_template, params_sent, response)
+        return response
+
+    return wrapper
 
-Webcheckin_And_Boarding_Pass_Agent_declaration = types.FunctionDeclaration(
-    name="Webcheckin_And_Boarding_Pass_Agent",
-    description="This **Webcheckin_And_Boarding_Pass_Agent** agents will take care of web checkin and boarding pass for given bookingID/PNR. If user is already checked-in this agent will send boarding pass given PNR / Booking ID  via supported communication channels such as WhatsApp, email, or SMS.",
-    parameters=types.Schema(
-        type=types.Type.OBJECT,
-        properties={
-            "journeys": types.Schema(
-                type=types.Type.ARRAY,
-                description="List of journeys for which user wants to do web check-in. Each journey can have different passengers.",
-                items=types.Schema(
-                    type=types.Type.OBJECT,
-                    properties={
-                        "origin": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the origin city (e.g., DEL).",
-                        ),
-                        "destination": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the destination city (e.g., BOM).",
-                        ),
-                        "isAllPax": types.Schema(
-                            type=types.Type.STRING,
-                            description="Set to true if user wants web check-in for all passengers on this journey, false if for specific passengers only.",
-                            default="true",
-                        ),
-                        "pax_info": types.Schema(
-                            type=types.Type.ARRAY,
-                            description="Required **only** when isAllPax = false. Provide list of specific passengers for web check-in on this journey.",
-                            items=types.Schema(
-                                type=types.Type.OBJECT,
-                                properties={
-                                    "fn": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="First Name of the passenger.",
-                                    ),
-                                    "ln": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="Last Name of the passenger.",
-                                    ),
-                                },
-                                required=["fn", "ln"],
-                            ),
-                        ),
-                    },
-                    required=["origin", "destination", "isAllPax"],
-                ),
-            )
-        },
-        required=["journeys"],
-    ),
-)
 
 # Python function implementations
 
 
+@_logged_tool
 async def NameCorrectionAgent(correction_type: str, fn: str, ln: str) -> dict:
     """Processes name corrections for a booking.
 
@@ -330,18 +234,14 @@ async def NameCorrectionAgent(correction_type: str, fn: str, ln: str) -> dict:
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "NameCorrectionAgent"
-    params_sent = {"correction_type": correction_type, "fn": fn, "ln": ln}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": f"Name correction of type {correction_type} for {fn} {ln} has been processed.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
 
 
+@_logged_tool
 async def SpecialClaimAgent(claim_type: str) -> dict:
     """Files a special claim for a flight booking.
 
@@ -357,18 +257,14 @@ async def SpecialClaimAgent(claim_type: str) -> dict:
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "SpecialClaimAgent"
-    params_sent = {"claim_type": claim_type}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": f"Special claim of type {claim_type} has been filed.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
 
 
+@_logged_tool
 async def Enquiry_Tool() -> dict:
     """Retrieves relevant documentation for a user's query.
 
@@ -379,18 +275,14 @@ async def Enquiry_Tool() -> dict:
         dict: A dictionary containing the status of the operation and a
               mock response message.
     """
-    tool_name = "Enquiry_Tool"
-    params_sent = {}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": "This is a mock response to your enquiry.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
 
 
+@_logged_tool
 async def Eticket_Sender_Agent(booking_id_or_pnr: str) -> dict:
     """Sends an e-ticket to the user for a given booking.
 
@@ -402,18 +294,14 @@ async def Eticket_Sender_Agent(booking_id_or_pnr: str) -> dict:
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "Eticket_Sender_Agent"
-    params_sent = {"booking_id_or_pnr": booking_id_or_pnr}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": f"E-ticket for booking {booking_id_or_pnr} has been sent.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
 
 
+@_logged_tool
 async def ObservabilityAgent(operation_type: str) -> dict:
     """Tracks the refund status for a given booking ID.
 
@@ -425,18 +313,14 @@ async def ObservabilityAgent(operation_type: str) -> dict:
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "ObservabilityAgent"
-    params_sent = {"operation_type": operation_type}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": f"Refund status for {operation_type} is being tracked.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
 
 
+@_logged_tool
 async def DateChangeAgent(action: str, sector_info: list) -> dict:
     """Quotes penalties or executes date change for an existing itinerary.
 
@@ -450,18 +334,14 @@ async def DateChangeAgent(action: str, sector_info: list) -> dict:
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "DateChangeAgent"
-    params_sent = {"action": action, "sector_info": sector_info}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": f"Date change action '{action}' has been processed for the provided sectors.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
 
 
+@_logged_tool
 async def Connect_To_Human_Tool(
     reason_of_invoke: str, frustration_score: str = None
 ) -> dict:
@@ -477,18 +357,11 @@ async def Connect_To_Human_Tool(
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "Connect_To_Human_Tool"
-    params_sent = {
-        "reason_of_invoke": reason_of_invoke,
-        "frustration_score": frustration_score,
-    }
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {"status": "SUCCESS", "message": "Connecting you to a human agent..."}
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
+    return {"status": "SUCCESS", "message": "Connecting you to a human agent..."}
 
 
+@_logged_tool
 async def Booking_Cancellation_Agent(
     action: str,
     cancel_scope: str = "NOT_MENTIONED",
@@ -513,23 +386,14 @@ async def Booking_Cancellation_Agent(
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "Booking_Cancellation_Agent"
-    params_sent = {
-        "action": action,
-        "cancel_scope": cancel_scope,
-        "otp": otp,
-        "partial_info": partial_info,
-    }
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": f"Booking cancellation action '{action}' has been processed.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
 
 
+@_logged_tool
 async def Flight_Booking_Details_Agent(booking_id_or_pnr: str) -> dict:
     """Retrieves the full itinerary record for a given PNR or Booking ID.
 
@@ -543,15 +407,11 @@ async def Flight_Booking_Details_Agent(booking_id_or_pnr: str) -> dict:
     Returns:
         dict: A dictionary containing the booking details.
     """
-    tool_name = "Flight_Booking_Details_Agent"
-    params_sent = {"booking_id_or_pnr": booking_id_or_pnr}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = travel_mock_data.get_booking_details(booking_id_or_pnr)
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
+    return get_booking_details(booking_id_or_pnr)
 
 
+@_logged_tool
 async def Webcheckin_And_Boarding_Pass_Agent(journeys: list) -> dict:
     """Handles web check-in and boarding pass requests.
 
@@ -567,30 +427,312 @@ async def Webcheckin_And_Boarding_Pass_Agent(journeys: list) -> dict:
         dict: A dictionary containing the status of the operation and a
               confirmation message.
     """
-    tool_name = "Webcheckin_And_Boarding_Pass_Agent"
-    params_sent = {"journeys": journeys}
-    _log_tool_event("INVOCATION_START", tool_name, params_sent)
     # Mock implementation
-    response = {
+    return {
         "status": "SUCCESS",
         "message": "Web check-in and boarding pass have been processed for the provided journeys.",
     }
-    _log_tool_event("INVOCATION_END", tool_name, params_sent, response)
-    return response
-
-
-# Tool instance containing all function declarations
-travel_tool = types.Tool(
-    function_declarations=[
-        NameCorrectionAgent_declaration,
-        SpecialClaimAgent_declaration,
-        Enquiry_Tool_declaration,
-        Eticket_Sender_Agent_declaration,
-        ObservabilityAgent_declaration,
-        DateChangeAgent_declaration,
-        Connect_To_Human_Tool_declaration,
-        Booking_Cancellation_Agent_declaration,
-        Flight_Booking_Details_Agent_declaration,
-        Webcheckin_And_Boarding_Pass_Agent_declaration,
-    ]
-)
+
+
+# Function Declarations from tool_call.json, built on first use and cached
+@functools.cache
+def get_travel_tool() -> types.Tool:
+    """Builds the Tool instance containing all function declarations."""
+    NameCorrectionAgent_declaration = types.FunctionDeclaration(
+        name="NameCorrectionAgent",
+        description="This **NameCorrectionAgent** will take care of name corrections  as well as name change also for given bookingID/PNR. This agent handles various types of name corrections including spelling corrections, name swaps, gender corrections, maiden name changes, and title removals.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "correction_type": types.Schema(
+                    type=types.Type.STRING,
+                    description="Type of name correction required.",
+                    enum=[
+                        "NAME_CORRECTION",
+                        "NAME_SWAP",
+                        "GENDER_SWAP",
+                        "MAIDEN_NAME_CHANGE",
+                        "REMOVE_TITLE",
+                    ],
+                ),
+                "fn": types.Schema(
+                    type=types.Type.STRING, description="First Name of the passenger."
+                ),
+                "ln": types.Schema(
+                    type=types.Type.STRING, description="Last Name of the passenger."
+                ),
+            },
+            required=["correction_type", "fn", "ln"],
+        ),
+    )
+
+    SpecialClaimAgent_declaration = types.FunctionDeclaration(
+        name="SpecialClaimAgent",
+        description="This **SpecialClaimAgent** handles special claim requests for flight bookings. This agent helps users file claims for various flight-related issues and disruptions.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "claim_type": types.Schema(
+                    type=types.Type.STRING,
+                    description="Type of special claim being filed by the user",
+                    enum=[
+                        "FLIGHT_NOT_OPERATIONAL",
+                        "MEDICAL_EMERGENCY",
+                        "TICKET_CANCELLED_WITH_AIRLINE",
+                    ],
+                )
+            },
+            required=["claim_type"],
+        ),
+    )
+
+    Enquiry_Tool_declaration = types.FunctionDeclaration(
+        name="Enquiry_Tool",
+        description="Helps user to get related documents for user query. Only help to retrieve relevant documentation for a enquiry or support.",
+        parameters=types.Schema(type=types.Type.OBJECT, properties={}),
+    )
+
+    Eticket_Sender_Agent_declaration = types.FunctionDeclaration(
+        name="Eticket_Sender_Agent",
+        description="Sends the e-ticket for the given PNR or Booking ID via supported communication channels whatsapp and email.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "booking_id_or_pnr": types.Schema(
+                    type=types.Type.STRING,
+                    description="The booking ID or PNR of the user itinerary.",
+                )
+            },
+            required=["booking_id_or_pnr"],
+        ),
+    )
+
+    ObservabilityAgent_declaration = types.FunctionDeclaration(
+        name="ObservabilityAgent",
+        description="This tool tracks or fetches the refund status for a given Booking ID based on a specific user operation.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "operation_type": types.Schema(
+                    type=types.Type.STRING,
+                    description="Type of operation_type being filed by the user",
+                    enum=["CANCELLATION", "DATE_CHANGE"],
+                )
+            },
+            required=["operation_type"],
+        ),
+    )
+
+    DateChangeAgent_declaration = types.FunctionDeclaration(
+        name="DateChangeAgent",
+        description="Quotes penalties or executes date change for an existing itinerary.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "action": types.Schema(
+                    type=types.Type.STRING,
+                    description="Choose QUOTE to fetch penalty/fare difference information, CONFIRM to execute the date change.",
+                    enum=["QUOTE", "CONFIRM"],
+                ),
+                "sector_info": types.Schema(
+                    type=types.Type.ARRAY,
+                    description="List of sectors/journeys to change with their new dates.",
+                    items=types.Schema(
+                        type=types.Type.OBJECT,
+                        properties={
+                            "origin": types.Schema(
+                                type=types.Type.STRING,
+                                description="Airport Code of the origin city (e.g., DEL).",
+                            ),
+                            "destination": types.Schema(
+                                type=types.Type.STRING,
+                                description="Airport Code of the destination city (e.g., BOM).",
+                            ),
+                            "newDate": types.Schema(
+                                type=types.Type.STRING,
+                                description="New date for the journey in YYYY-MM-DD format (e.g., 2024-01-15).",
+                            ),
+                        },
+                        required=["origin", "destination", "newDate"],
+                    ),
+                ),
+            },
+            required=["action", "sector_info"],
+        ),
+    )
+
+    Connect_To_Human_Tool_declaration = types.FunctionDeclaration(
+        name="Connect_To_Human_Tool",
+        description="Helps user to connect with human agent.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "reason_of_invoke": types.Schema(
+                    type=types.Type.STRING,
+                    description="Was the user frustrated or you are not able to help.",
+                    enum=["FRUSTRATED", "UNABLE_TO_HELP"],
+                ),
+                "frustration_score": types.Schema(
+                    type=types.Type.STRING,
+                    description="How frustrated is the user in the conversation on a scale of 1 to 10.",
+                ),
+            },
+            required=["reason_of_invoke"],
+        ),
+    )
+
+    Booking_Cancellation_Agent_declaration = types.FunctionDeclaration(
+        name="Booking_Cancellation_Agent",
+        description="Quotes penalties or executes cancellations for an existing itinerary.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "action": types.Schema(
+                    type=types.Type.STRING,
+                    description="Choose QUOTE to fetch refund/penalty information, CONFIRM to execute the cancellation.",
+                    enum=["QUOTE", "CONFIRM"],
+                    default="QUOTE",
+                ),
+                "cancel_scope": types.Schema(
+                    type=types.Type.STRING,
+                    description="Defaults to NOT_MENTIONED. Type of cancellation - FULL or PARTIAL. Don't ask this information upfront. ONLY fill when user mentions about it.",
+                    enum=["NOT_MENTIONED", "FULL", "PARTIAL"],
+                    default="NOT_MENTIONED",
+                ),
+                "otp": types.Schema(
+                    type=types.Type.STRING,
+                    description="OTP (One Time Password) for confirmation use case. And it's length is **4 digit**. NOT A MANDATORY FIELD.",
+                    default="",
+                ),
+                "partial_info": types.Schema(
+                    type=types.Type.ARRAY,
+                    description="Required **only** when cancel_scope = PARTIAL. Provide a list of journeys and passengers to cancel.",
+                    items=types.Schema(
+                        type=types.Type.OBJECT,
+                        properties={
+                            "journey": types.Schema(
+                                type=types.Type.OBJECT,
+                                properties={
+                                    "from_city": types.Schema(
+                                        type=types.Type.STRING,
+                                        description="Airport Code of the origin city (e.g., DEL).",
+                                    ),
+                                    "to_city": types.Schema(
+                                        type=types.Type.STRING,
+                                        description="Airport Code of the destination city (e.g., BOM).",
+                                    ),
+                                },
+                            ),
+                            "pax_to_cancel": types.Schema(
+                                type=types.Type.ARRAY,
+                                description="List of passengers to cancel for the specified journey.",
+                                items=types.Schema(
+                                    type=types.Type.OBJECT,
+                                    properties={
+                                        "fn": types.Schema(
+                                            type=types.Type.STRING,
+                                            description="First Name of the passenger.",
+                                        ),
+                                        "ln": types.Schema(
+                                            type=types.Type.STRING,
+                                            description="Last Name of the passenger.",
+                                        ),
+                                    },
+                                ),
+                            ),
+                        },
+                    ),
+                ),
+            },
+            required=["action"],
+        ),
+    )
+
+    Flight_Booking_Details_Agent_declaration = types.FunctionDeclaration(
+        name="Flight_Booking_Details_Agent",
+        description="Retrieves the full itinerary record for a given PNR / Booking ID—passengers, flight segments, departure & arrival times, airlines, fare classes, and ancillary add-ons.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "booking_id_or_pnr": types.Schema(
+                    type=types.Type.STRING,
+                    description="The booking ID or PNR of the user itinerary.",
+                )
+            },
+            required=["booking_id_or_pnr"],
+        ),
+    )
+
+    Webcheckin_And_Boarding_Pass_Agent_declaration = types.FunctionDeclaration(
+        name="Webcheckin_And_Boarding_Pass_Agent",
+        description="This **Webcheckin_And_Boarding_Pass_Agent** agents will take care of web checkin and boarding pass for given bookingID/PNR. If user is already checked-in this agent will send boarding pass given PNR / Booking ID  via supported communication channels such as WhatsApp, email, or SMS.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "journeys": types.Schema(
+                    type=types.Type.ARRAY,
+                    description="List of journeys for which user wants to do web check-in. Each journey can have different passengers.",
+                    items=types.Schema(
+                        type=types.Type.OBJECT,
+                        properties={
+                            "origin": types.Schema(
+                                type=types.Type.STRING,
+                                description="Airport Code of the origin city (e.g., DEL).",
+                            ),
+                            "destination": types.Schema(
+                                type=types.Type.STRING,
+                                description="Airport Code of the destination city (e.g., BOM).",
+                            ),
+                            "isAllPax": types.Schema(
+                                type=types.Type.STRING,
+                                description="Set to true if user wants web check-in for all passengers on this journey, false if for specific passengers only.",
+                                default="true",
+                            ),
+                            "pax_info": types.Schema(
+                                type=types.Type.ARRAY,
+                                description="Required **only** when isAllPax = false. Provide list of specific passengers for web check-in on this journey.",
+                                items=types.Schema(
+                                    type=types.Type.OBJECT,
+                                    properties={
+                                        "fn": types.Schema(
+                                            type=types.Type.STRING,
+                                            description="First Name of the passenger.",
+                                        ),
+                                        "ln": types.Schema(
+                                            type=types.Type.STRING,
+                                            description="Last Name of the passenger.",
+                                        ),
+                                    },
+                                    required=["fn", "ln"],
+                                ),
+                            ),
+                        },
+                        required=["origin", "destination", "isAllPax"],
+                    ),
+                )
+            },
+            required=["journeys"],
+        ),
+    )
+
+    return types.Tool(
+        function_declarations=[
+            NameCorrectionAgent_declaration,
+            SpecialClaimAgent_declaration,
+            Enquiry_Tool_declaration,
+            Eticket_Sender_Agent_declaration,
+            ObservabilityAgent_declaration,
+            DateChangeAgent_declaration,
+            Connect_To_Human_Tool_declaration,
+            Booking_Cancellation_Agent_declaration,
+            Flight_Booking_Details_Agent_declaration,
+            Webcheckin_And_Boarding_Pass_Agent_declaration,
+        ]
+    )
+
+
+def __getattr__(name):
+    # Keeps `from gemini_tools import travel_tool` working without building it at import
+    if name == "travel_tool":
+        return get_travel_tool()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
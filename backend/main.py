@@ -5,6 +5,7 @@ import uuid  # Added for generating unique IDs
 import sys  # Added for stdout redirection
 import io  # Added for stdout redirection
 import json  # Added for parsing log strings
+import threading  # Per-thread partial lines in StdoutTee
 from quart import Quart, websocket, jsonify
 from quart_cors import cors
 from websockets.exceptions import ConnectionClosedOK
@@ -14,7 +15,7 @@ from dotenv import load_dotenv
 from datetime import datetime, timezone  # For timestamping raw stdout logs
 
 from gemini_tools import (
-    travel_tool,
+    get_travel_tool,
     NameCorrectionAgent,
     SpecialClaimAgent,
     Enquiry_Tool,
@@ -26,7 +27,12 @@ from gemini_tools import (
     Flight_Booking_Details_Agent,
     Webcheckin_And_Boarding_Pass_Agent
 )
-from travel_mock_data import GLOBAL_LOG_STORE  # Import the global log store
+from travel_mock_data import (  # Log store snapshot, console colors, stdout line lock
+    get_recent_logs,
+    GREEN,
+    RESET,
+    STDOUT_LOCK,
+)
 
 load_dotenv()
 
@@ -39,10 +45,23 @@ class StdoutTee(io.TextIOBase):
     def __init__(self, original_stdout, log_list):
         self._original_stdout = original_stdout
         self._log_list = log_list
+        # print() writes its text and the "\n" separately; hold each thread's unfinished
+        # line so lines from background writers can't land in the middle of it
+        self._partial = threading.local()
 
     def write(self, s):
-        self._original_stdout.write(s)  # Write to original stdout (console)
-        s_stripped = s.strip()
+        text = getattr(self._partial, "text", "") + s
+        if not text.endswith("\n"):
+            self._partial.text = text
+            return len(s)
+        self._partial.text = ""
+        self._emit(text)
+        return len(s)
+
+    def _emit(self, text):
+        with STDOUT_LOCK:
+            self._original_stdout.write(text)  # Write to original stdout (console)
+        s_stripped = text.strip()
         if s_stripped:  # Avoid empty lines
             try:
                 # Attempt to parse as JSON, assuming logs from gemini_tools are JSON strings
@@ -64,9 +83,12 @@ class StdoutTee(io.TextIOBase):
                     "log_type": "RAW_STDOUT",
                     "message": s_stripped
                 })
-        return len(s)
 
     def flush(self):
+        text = getattr(self._partial, "text", "")
+        if text:
+            self._partial.text = ""
+            self._emit(text)
         self._original_stdout.flush()
 
 
@@ -123,6 +145,7 @@ async def websocket_endpoint():
     print(
         f"🎙️ Voice Activity Detection: {'DISABLED' if disable_vad else 'ENABLED'}")
 
+    travel_tool = get_travel_tool()  # Built once per process, cached after
     gemini_live_config = types.LiveConnectConfig(
         response_modalities=["AUDIO"],  # Matched to reference
         # system_instruction="""***CRITICAL: TOOL USAGE INSTRUCTIONS***
@@ -385,6 +408,46 @@ async def websocket_endpoint():
                     "Flight_Booking_Details_Agent": Flight_Booking_Details_Agent,
                     "Webcheckin_And_Boarding_Pass_Agent": Webcheckin_And_Boarding_Pass_Agent
                 }
+
+                async def execute_function_call(fc):
+                    print(
+                        f"{GREEN}Quart Backend: Gemini requests function call: {fc.name} with args: {dict(fc.args)}{RESET}")
+
+                    function_to_call = available_functions.get(fc.name)
+                    function_response_content = None
+
+                    if function_to_call:
+                        try:
+                            # Execute the actual local function
+                            function_args = dict(fc.args)
+                            print(
+                                f"{GREEN}Quart Backend: Calling function {fc.name} with args: {function_args}{RESET}")
+                            # Await the async function call
+                            result = await function_to_call(**function_args)
+                            if isinstance(result, str):
+                                function_response_content = {"content": result}
+                            else:
+                                # Assumes result is already a dict if not a string
+                                function_response_content = result
+                            print(
+                                f"{GREEN}Quart Backend: Function {fc.name} executed. Result: {result}{RESET}")
+                        except Exception as e:
+                            print(
+                                f"Quart Backend: Error executing function {fc.name}: {e}")
+                            traceback.print_exc()  # Add if not already there
+                            function_response_content = {
+                                "status": "error", "message": str(e)}
+                    else:
+                        print(f"Quart Backend: Function {fc.name} not found.")
+                        function_response_content = {
+                            "status": "error", "message": f"Function {fc.name} not implemented or available."}
+
+                    return types.FunctionResponse(
+                        id=fc.id,
+                        name=fc.name,
+                        response=function_response_content
+                    )
+
                 current_user_utterance_id = None
                 # Renamed from latest_user_speech_text and initialized
                 accumulated_user_speech_text = ""
@@ -614,55 +677,15 @@ async def websocket_endpoint():
 
                             elif response.tool_call:
                                 print(
-                                    f"\033[92mQuart Backend: Received tool_call from Gemini: {response.tool_call}\033[0m")
-                                function_responses = []
-                                for fc in response.tool_call.function_calls:
-                                    print(
-                                        f"\033[92mQuart Backend: Gemini requests function call: {fc.name} with args: {dict(fc.args)}\033[0m")
-
-                                    function_to_call = available_functions.get(
-                                        fc.name)
-                                    function_response_content = None
-
-                                    if function_to_call:
-                                        try:
-                                            # Execute the actual local function
-                                            function_args = dict(fc.args)
-                                            print(
-                                                f"\033[92mQuart Backend: Calling function {fc.name} with args: {function_args}\033[0m")
-                                            # Await the async function call
-                                            result = await function_to_call(**function_args)
-                                            if isinstance(result, str):
-                                                function_response_content = {
-                                                    "content": result}
-                                            else:
-                                                # Assumes result is already a dict if not a string
-                                                function_response_content = result
-                                            print(
-                                                f"\033[92mQuart Backend: Function {fc.name} executed. Result: {result}\033[0m")
-                                        except Exception as e:
-                                            print(
-                                                f"Quart Backend: Error executing function {fc.name}: {e}")
-                                            traceback.print_exc()  # Add if not already there
-                                            function_response_content = {
-                                                "status": "error", "message": str(e)}
-                                    else:
-                                        print(
-                                            f"Quart Backend: Function {fc.name} not found.")
-                                        function_response_content = {
-                                            "status": "error", "message": f"Function {fc.name} not implemented or available."}
-
-                                    function_response = types.FunctionResponse(
-                                        id=fc.id,
-                                        name=fc.name,
-                                        response=function_response_content
-                                    )
-                                    function_responses.append(
-                                        function_response)
+                                    f"{GREEN}Quart Backend: Received tool_call from Gemini: {response.tool_call}{RESET}")
+                                # Independent function calls in the same turn run concurrently
+                                function_responses = await asyncio.gather(
+                                    *(execute_function_call(fc) for fc in response.tool_call.function_calls)
+                                )
 
                                 if function_responses:
                                     print(
-                                        f"\033[92mQuart Backend: Sending {len(function_responses)} function response(s) to Gemini.\033[0m")
+                                        f"{GREEN}Quart Backend: Sending {len(function_responses)} function response(s) to Gemini.{RESET}")
                                     await session.send_tool_response(function_responses=function_responses)
                                 else:
                                     print(
@@ -760,7 +783,7 @@ async def get_logs():
     """API endpoint to fetch captured logs."""
     # Combine logs from BQ's global store and our captured stdout logs
     # Return copies to avoid issues if the lists are modified during serialization
-    combined_logs = list(GLOBAL_LOG_STORE) + list(CAPTURED_STDOUT_LOGS)
+    combined_logs = get_recent_logs() + list(CAPTURED_STDOUT_LOGS)
 
     # Optional: Sort by timestamp if all logs have a compatible timestamp field
     # For now, just concatenating. Assuming GLOBAL_LOG_STORE entries also have a timestamp
@@ -1,14 +1,40 @@
+import atexit
 import datetime
 import logging
+import os
+import queue
 import sys
+import threading
 import json
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, List, Optional, Any
 from dotenv import load_dotenv
 
+try:
+    import orjson
+
+    def json_dumps(obj) -> str:
+        """Serialize obj to a JSON string using orjson."""
+        return orjson.dumps(obj).decode()
+
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+
+    def json_dumps(obj) -> str:
+        """Serialize obj to a JSON string using the stdlib json module."""
+        return json.dumps(obj)
+
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Held for every whole-line write to stdout (log handler, TOOL_EVENT writer, main.py's
+# StdoutTee) so lines from background threads never land inside another line
+STDOUT_LOCK = threading.RLock()
+
 # Configure logging
+_root_logger = logging.getLogger()
+_configures_root_logging = not _root_logger.handlers
 logging.basicConfig(
     stream=sys.stdout,
     level=logging.INFO,
@@ -17,8 +43,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global store for logs (maintaining compatibility with original structure)
-GLOBAL_LOG_STORE = []
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that defers formatting and never loses ERROR records."""
+
+    def __init__(self, log_queue, listener):
+        super().__init__(log_queue)
+        self.listener = listener
+        self.dropped_records = 0  # Below-ERROR records discarded while the queue was full
+
+    def prepare(self, record):
+        # Leave the record unformatted so serialization happens on the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.ERROR:
+                # Errors are worth the stall: write them on the caller's thread
+                self.listener.handle(record)
+            else:
+                self.dropped_records += 1
+
+
+# When this module set up root logging, move the stdout handler behind a bounded
+# queue so formatting and writes happen on a background thread. Records of every
+# level share the queue, keeping their order. Loggers keep propagating to root, so
+# handlers added to root later (app config, Cloud Logging, caplog) still see them.
+# If the application configured root first, its handlers are left untouched.
+_LOG_QUEUE = queue.Queue(maxsize=10_000)
+_log_listener = None
+if _configures_root_logging:
+    _log_listener = QueueListener(
+        _LOG_QUEUE, *_root_logger.handlers, respect_handler_level=True
+    )
+    for _handler in _log_listener.handlers:
+        _root_logger.removeHandler(_handler)
+        if getattr(_handler, "stream", None) is sys.stdout:
+            _handler.lock = STDOUT_LOCK
+    _root_logger.addHandler(_NonBlockingQueueHandler(_LOG_QUEUE, _log_listener))
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# ANSI colors only help on an interactive terminal; skip them on Cloud Run / piped output
+_USE_COLOR = sys.stdout.isatty() and not os.getenv("K_SERVICE")
+# Shared with main.py's console prints
+GREEN, RESET = ("\033[92m", "\033[0m") if _USE_COLOR else ("", "")
+
+# Global store for logs (maintaining compatibility with original structure).
+# Bounded so long-running processes keep only the most recent entries.
+MAX_LOG_STORE_ENTRIES = 10_000
+GLOBAL_LOG_STORE = deque(maxlen=MAX_LOG_STORE_ENTRIES)
 
 # User ID (maintaining compatibility)
 USER_ID = "shubham"
@@ -38,9 +114,37 @@ MOCK_DATA_STORE = {
     "weather": {},
 }
 
+# Casefolded city -> record(s); rebuilt by initialize_mock_data to avoid full scans
+_DESTINATIONS_BY_CITY = {}
+_WEATHER_BY_CITY = {}
+_HOTELS_BY_CITY = {}
+_ACTIVITIES_BY_CITY = {}
+
 # --- Helper Functions ---
 
 
+def _build_city_indexes():
+    """Rebuild the per-city lookup indexes from MOCK_DATA_STORE."""
+    _DESTINATIONS_BY_CITY.clear()
+    _WEATHER_BY_CITY.clear()
+    _HOTELS_BY_CITY.clear()
+    _ACTIVITIES_BY_CITY.clear()
+
+    for dest in MOCK_DATA_STORE["destinations"].values():
+        _DESTINATIONS_BY_CITY.setdefault(dest["city"].casefold(), dest)
+
+    for weather_city, weather_data in MOCK_DATA_STORE["weather"].items():
+        _WEATHER_BY_CITY.setdefault(weather_city.casefold(), weather_data)
+
+    for hotel in MOCK_DATA_STORE["hotels"].values():
+        _HOTELS_BY_CITY.setdefault(hotel["city"].casefold(), []).append(hotel)
+
+    for activity in MOCK_DATA_STORE["activities"].values():
+        _ACTIVITIES_BY_CITY.setdefault(activity["city"].casefold(), []).append(
+            activity
+        )
+
+
 def generate_booking_id():
     """Generate simple sequential booking IDs like BK001, BK002, etc."""
     global BOOKING_COUNTER
@@ -51,6 +155,18 @@ def generate_booking_id():
 # --- Structured Logging Helper ---
 
 
+class _LazyJson:
+    """Log argument that serializes its entry to JSON only when formatted."""
+
+    __slots__ = ("entry",)
+
+    def __init__(self, entry: dict):
+        self.entry = entry
+
+    def __str__(self) -> str:
+        return json_dumps(self.entry)
+
+
 def log_travel_interaction(
     func_name: str,
     params: dict,
@@ -69,13 +185,21 @@ def log_travel_interaction(
     if error_message:
         log_entry["error_message"] = error_message
 
-    # Store the log entry in the global list
+    # Store the log entry in the bounded global store
     GLOBAL_LOG_STORE.append(log_entry)
 
-    if "ERROR" in status.upper() or "FAIL" in status.upper():
-        logger.error(json.dumps(log_entry))
+    # The JSON message text is only rendered if a handler actually formats the record
+    message = _LazyJson(log_entry)
+    status_upper = status.upper()
+    if "ERROR" in status_upper or "FAIL" in status_upper:
+        logger.error("%s", message)
     else:
-        logger.info(f"\033[92m{json.dumps(log_entry)}\033[0m")
+        logger.info(f"{GREEN}%s{RESET}", message)
+
+
+def get_recent_logs() -> list:
+    """Return a snapshot of the retained log entries as a list."""
+    return list(GLOBAL_LOG_STORE)
 
 
 # --- Mock Data Initialization ---
@@ -370,6 +494,8 @@ def initialize_mock_data():
         },
     }
 
+    _build_city_indexes()
+
 
 # --- Travel Function Implementations ---
 
@@ -388,13 +514,15 @@ def search_flights(
 
     try:
         # Filter flights based on origin and destination
+        origin_key = origin.casefold()
+        destination_key = destination.casefold()
         matching_flights = []
         for flight_id, flight in MOCK_DATA_STORE["flights"].items():
             if (
-                flight["origin"].lower() == origin.lower()
-                or flight["origin_city"].lower() == origin.lower()
-                or flight["destination"].lower() == destination.lower()
-                or flight["destination_city"].lower() == destination.lower()
+                flight["origin"].casefold() == origin_key
+                or flight["origin_city"].casefold() == origin_key
+                or flight["destination"].casefold() == destination_key
+                or flight["destination_city"].casefold() == destination_key
             ):
 
                 # Check if flight has enough available seats
@@ -444,7 +572,8 @@ def book_flight(
 
     try:
         # Check if flight exists
-        if flight_id not in MOCK_DATA_STORE["flights"]:
+        flight = MOCK_DATA_STORE["flights"].get(flight_id)
+        if flight is None:
             log_travel_interaction(
                 func_name,
                 params,
@@ -456,8 +585,6 @@ def book_flight(
                 "message": f"Flight {flight_id} not found",
             }
 
-        flight = MOCK_DATA_STORE["flights"][flight_id]
-
         # Check availability
         if flight["available_seats"] < passengers:
             log_travel_interaction(
@@ -489,7 +616,7 @@ def book_flight(
         }
 
         # Update flight availability
-        MOCK_DATA_STORE["flights"][flight_id]["available_seats"] -= passengers
+        flight["available_seats"] -= passengers
 
         # Store booking
         MOCK_DATA_STORE["bookings"][booking_id] = booking
@@ -522,7 +649,8 @@ def get_flight_status(booking_id: str) -> dict:
     params = {"booking_id": booking_id}
 
     try:
-        if booking_id not in MOCK_DATA_STORE["bookings"]:
+        booking = MOCK_DATA_STORE["bookings"].get(booking_id)
+        if booking is None:
             log_travel_interaction(
                 func_name,
                 params,
@@ -534,7 +662,6 @@ def get_flight_status(booking_id: str) -> dict:
                 "message": f"Booking {booking_id} not found",
             }
 
-        booking = MOCK_DATA_STORE["bookings"][booking_id]
         if booking["type"] != "flight":
             log_travel_interaction(
                 func_name,
@@ -594,11 +721,10 @@ def search_hotels(
     try:
         # Filter hotels by city
         matching_hotels = []
-        for hotel_id, hotel in MOCK_DATA_STORE["hotels"].items():
-            if hotel["city"].lower() == city.lower():
-                # Check if hotel has enough available rooms
-                if hotel["available_rooms"] >= 1:  # Assuming 1 room requested
-                    matching_hotels.append(hotel)
+        for hotel in _HOTELS_BY_CITY.get(city.casefold(), ()):
+            # Check if hotel has enough available rooms
+            if hotel["available_rooms"] >= 1:  # Assuming 1 room requested
+                matching_hotels.append(hotel)
 
         if not matching_hotels:
             log_travel_interaction(
@@ -649,8 +775,28 @@ def book_hotel(
     }
 
     try:
+        # Validate the stay dates before touching the hotel store
+        check_in = datetime.datetime.fromisoformat(check_in_date.replace("Z", "+00:00"))
+        check_out = datetime.datetime.fromisoformat(
+            check_out_date.replace("Z", "+00:00")
+        )
+        nights = (check_out - check_in).days
+
+        if nights <= 0:
+            log_travel_interaction(
+                func_name,
+                params,
+                status="INVALID_DATES",
+                error_message="Check-out date must be after check-in date",
+            )
+            return {
+                "status": "INVALID_DATES",
+                "message": "Check-out date must be after check-in date",
+            }
+
         # Check if hotel exists
-        if hotel_id not in MOCK_DATA_STORE["hotels"]:
+        hotel = MOCK_DATA_STORE["hotels"].get(hotel_id)
+        if hotel is None:
             log_travel_interaction(
                 func_name,
                 params,
@@ -662,8 +808,6 @@ def book_hotel(
                 "message": f"Hotel {hotel_id} not found",
             }
 
-        hotel = MOCK_DATA_STORE["hotels"][hotel_id]
-
         # Check availability
         if hotel["available_rooms"] < rooms:
             log_travel_interaction(
@@ -677,25 +821,6 @@ def book_hotel(
                 "message": f"Only {hotel['available_rooms']} rooms available",
             }
 
-        # Calculate number of nights
-        check_in = datetime.datetime.fromisoformat(check_in_date.replace("Z", "+00:00"))
-        check_out = datetime.datetime.fromisoformat(
-            check_out_date.replace("Z", "+00:00")
-        )
-        nights = (check_out - check_in).days
-
-        if nights <= 0:
-            log_travel_interaction(
-                func_name,
-                params,
-                status="INVALID_DATES",
-                error_message="Check-out date must be after check-in date",
-            )
-            return {
-                "status": "INVALID_DATES",
-                "message": "Check-out date must be after check-in date",
-            }
-
         # Create booking
         booking_id = generate_booking_id()
         booking = {
@@ -717,7 +842,7 @@ def book_hotel(
         }
 
         # Update hotel availability
-        MOCK_DATA_STORE["hotels"][hotel_id]["available_rooms"] -= rooms
+        hotel["available_rooms"] -= rooms
 
         # Store booking
         MOCK_DATA_STORE["bookings"][booking_id] = booking
@@ -751,7 +876,8 @@ def get_booking_details(booking_id: str) -> dict:
     params = {"booking_id": booking_id}
 
     try:
-        if booking_id not in MOCK_DATA_STORE["bookings"]:
+        booking = MOCK_DATA_STORE["bookings"].get(booking_id)
+        if booking is None:
             log_travel_interaction(
                 func_name,
                 params,
@@ -763,8 +889,6 @@ def get_booking_details(booking_id: str) -> dict:
                 "message": f"Booking {booking_id} not found",
             }
 
-        booking = MOCK_DATA_STORE["bookings"][booking_id]
-
         log_travel_interaction(
             func_name,
             params,
@@ -828,7 +952,8 @@ def cancel_booking(booking_id: str) -> dict:
     params = {"booking_id": booking_id}
 
     try:
-        if booking_id not in MOCK_DATA_STORE["bookings"]:
+        booking = MOCK_DATA_STORE["bookings"].get(booking_id)
+        if booking is None:
             log_travel_interaction(
                 func_name,
                 params,
@@ -840,8 +965,6 @@ def cancel_booking(booking_id: str) -> dict:
                 "message": f"Booking {booking_id} not found",
             }
 
-        booking = MOCK_DATA_STORE["bookings"][booking_id]
-
         if booking["status"] == "CANCELLED":
             log_travel_interaction(
                 func_name,
@@ -855,21 +978,17 @@ def cancel_booking(booking_id: str) -> dict:
             }
 
         # Update booking status
-        MOCK_DATA_STORE["bookings"][booking_id]["status"] = "CANCELLED"
+        booking["status"] = "CANCELLED"
 
         # Restore availability based on booking type
         if booking["type"] == "flight":
-            flight_id = booking["flight_id"]
-            if flight_id in MOCK_DATA_STORE["flights"]:
-                MOCK_DATA_STORE["flights"][flight_id]["available_seats"] += booking[
-                    "passengers"
-                ]
+            flight = MOCK_DATA_STORE["flights"].get(booking["flight_id"])
+            if flight is not None:
+                flight["available_seats"] += booking["passengers"]
         elif booking["type"] == "hotel":
-            hotel_id = booking["hotel_id"]
-            if hotel_id in MOCK_DATA_STORE["hotels"]:
-                MOCK_DATA_STORE["hotels"][hotel_id]["available_rooms"] += booking[
-                    "rooms"
-                ]
+            hotel = MOCK_DATA_STORE["hotels"].get(booking["hotel_id"])
+            if hotel is not None:
+                hotel["available_rooms"] += booking["rooms"]
 
         log_travel_interaction(
             func_name,
@@ -897,11 +1016,7 @@ def get_destination_info(city: str) -> dict:
 
     try:
         # Search for destination by city name
-        destination_found = None
-        for dest_id, dest in MOCK_DATA_STORE["destinations"].items():
-            if dest["city"].lower() == city.lower():
-                destination_found = dest
-                break
+        destination_found = _DESTINATIONS_BY_CITY.get(city.casefold())
 
         if not destination_found:
             log_travel_interaction(
@@ -938,11 +1053,7 @@ def get_weather_info(city: str) -> dict:
 
     try:
         # Search for weather data by city name
-        weather_found = None
-        for weather_city, weather_data in MOCK_DATA_STORE["weather"].items():
-            if weather_city.lower() == city.lower():
-                weather_found = weather_data
-                break
+        weather_found = _WEATHER_BY_CITY.get(city.casefold())
 
         if not weather_found:
             log_travel_interaction(
@@ -978,14 +1089,14 @@ def search_activities(city: str, activity_type: str = None) -> dict:
     params = {"city": city, "activity_type": activity_type}
 
     try:
+        activity_type_key = activity_type.casefold() if activity_type else None
         matching_activities = []
-        for activity_id, activity in MOCK_DATA_STORE["activities"].items():
-            if activity["city"].lower() == city.lower():
-                if (
-                    not activity_type
-                    or activity["type"].lower() == activity_type.lower()
-                ):
-                    matching_activities.append(activity)
+        for activity in _ACTIVITIES_BY_CITY.get(city.casefold(), ()):
+            if (
+                not activity_type_key
+                or activity["type"].casefold() == activity_type_key
+            ):
+                matching_activities.append(activity)
 
         if not matching_activities:
             log_travel_interaction(
@@ -1043,24 +1154,6 @@ def test_travel_system():
         return {"status": "ERROR", "message": f"Travel system test failed: {str(e)}"}
 
 
-# Example usage (for testing purposes)
-if __name__ == "__main__":
-    logger.info(f"Travel Mock Data System Initialized")
-    logger.info(f"Using User ID: {USER_ID}\n")
-
-    logger.info("--- Test Travel System ---")
-    test_result = test_travel_system()
-    logger.info(f"Test Result: {test_result}\n")
-
-    logger.info("--- Search Flights (Mumbai to Dubai) ---")
-    flights = search_flights("Mumbai", "Dubai", "2024-02-15")
-    logger.info(flights)
-
-    logger.info("\n--- Search Hotels (Dubai) ---")
-    hotels = search_hotels("Dubai", "2024-02-15", "2024-02-17")
-    logger.info(hotels)
-
-
 def handle_name_correction(correction_type: str, fn: str, ln: str) -> dict:
     """Handles name correction requests."""
     func_name = "handle_name_correction"
@@ -1212,3 +1305,21 @@ def handle_webcheckin_and_boarding_pass(journeys: list) -> dict:
         "status": "SUCCESS",
         "message": "Web check-in and boarding pass have been processed for the provided journeys.",
     }
+
+
+# Example usage (for testing purposes)
+if __name__ == "__main__":
+    logger.info(f"Travel Mock Data System Initialized")
+    logger.info(f"Using User ID: {USER_ID}\n")
+
+    logger.info("--- Test Travel System ---")
+    test_result = test_travel_system()
+    logger.info(f"Test Result: {test_result}\n")
+
+    logger.info("--- Search Flights (Mumbai to Dubai) ---")
+    flights = search_flights("Mumbai", "Dubai", "2024-02-15")
+    logger.info(flights)
+
+    logger.info("\n--- Search Hotels (Dubai) ---")
+    hotels = search_hotels("Dubai", "2024-02-15", "2024-02-17")
+    logger.info(hotels)